@@ -3,11 +3,17 @@ from .temperature import TemperatureSensor
 from .humidity import HumiditySensor
 from .pressure import PressureSensor
 from .light import LightSensor
+from .compression import DeadbandCompressor, SwingingDoorCompressor, create_compressor, reconstruct, time_weighted_average
 
 __all__ = [
     "Sensor",
     "TemperatureSensor",
     "HumiditySensor",
     "PressureSensor",
-    "LightSensor"
+    "LightSensor",
+    "DeadbandCompressor",
+    "SwingingDoorCompressor",
+    "create_compressor",
+    "reconstruct",
+    "time_weighted_average"
 ]
@@ -0,0 +1,232 @@
+from bisect import bisect_right
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+Point = Tuple[datetime, float]
+
+
+class Compressor:
+    """
+    Bazowa klasa kompresji odczytów po stronie czujnika.
+
+    process() przyjmuje każdy surowy odczyt i zwraca listę punktów do zapisania
+    i wysłania (zwykle pustą). Punkt jest emitowany również wtedy, gdy od ostatniego
+    minęło max_silence_s sekund (heartbeat).
+    """
+
+    interpolation = "step"
+
+    def __init__(self, deviation: float, max_silence_s: float = 60.0):
+        if deviation < 0:
+            raise ValueError("Dopuszczalne odchylenie nie może być ujemne.")
+        self.deviation = deviation
+        self.max_silence_s = max_silence_s
+        self.received = 0
+        self.emitted = 0
+        self._last_emitted: Optional[Point] = None
+        self._pending: Optional[Point] = None
+
+    def process(self, timestamp: datetime, value: float) -> List[Point]:
+        self.received += 1
+        return self._count(self._process(timestamp, value))
+
+    def flush(self) -> List[Point]:
+        """
+        Emituje ostatni niewyemitowany odczyt, aby szereg kończył się w chwili ostatniego pomiaru.
+        """
+        if self._pending is None:
+            return []
+        return self._count([self._archive(self._final_point())])
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.received / self.emitted if self.emitted else 1.0
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "emitted": self.emitted,
+            "compression_ratio": round(self.compression_ratio, 2)
+        }
+
+    def _process(self, timestamp: datetime, value: float) -> List[Point]:
+        raise NotImplementedError("Metoda musi być nadpisana w klasie potomnej.")
+
+    def _final_point(self) -> Point:
+        return self._pending
+
+    def _archive(self, point: Point) -> Point:
+        self._last_emitted = point
+        self._pending = None
+        return point
+
+    def _count(self, points: List[Point]) -> List[Point]:
+        self.emitted += len(points)
+        return points
+
+    def _silence_exceeded(self, timestamp: datetime) -> bool:
+        return (timestamp - self._last_emitted[0]).total_seconds() >= self.max_silence_s
+
+
+class DeadbandCompressor(Compressor):
+    """
+    Emituje odczyt, gdy różni się od ostatnio wyemitowanego o więcej niż deviation.
+    Rekonstrukcja: wartość ostatniego punktu utrzymywana do następnego (step).
+    """
+
+    interpolation = "step"
+
+    def _process(self, timestamp: datetime, value: float) -> List[Point]:
+        point = (timestamp, value)
+        if (self._last_emitted is None
+                or abs(value - self._last_emitted[1]) > self.deviation
+                or self._silence_exceeded(timestamp)):
+            return [self._archive(point)]
+        self._pending = point
+        return []
+
+
+class SwingingDoorCompressor(Compressor):
+    """
+    Kompresja swinging-door trending: punkty pośrednie leżą w odległości
+    co najwyżej deviation od odcinka łączącego wyemitowane punkty.
+    Rekonstrukcja: interpolacja liniowa między punktami.
+    """
+
+    interpolation = "linear"
+
+    def __init__(self, deviation: float, max_silence_s: float = 60.0):
+        super().__init__(deviation, max_silence_s)
+        self._reset_doors()
+
+    def _reset_doors(self) -> None:
+        self._upper_slope = float("inf")
+        self._lower_slope = float("-inf")
+
+    def _update_doors(self, timestamp: datetime, value: float) -> bool:
+        """
+        Zawęża drzwi o nowy punkt; zwraca False, gdy drzwi się rozeszły.
+        """
+        archived_time, archived_value = self._last_emitted
+        dt = (timestamp - archived_time).total_seconds()
+        if dt <= 0:
+            return abs(value - archived_value) <= self.deviation
+        self._upper_slope = min(self._upper_slope, (value - archived_value + self.deviation) / dt)
+        self._lower_slope = max(self._lower_slope, (value - archived_value - self.deviation) / dt)
+        return self._lower_slope <= self._upper_slope
+
+    def _fit(self, point: Point) -> Point:
+        """
+        Dopasowuje punkt do korytarza drzwi, aby odcinek od ostatnio wyemitowanego
+        punktu mieścił się w odchyleniu dla wszystkich odczytów pośrednich.
+        """
+        timestamp, value = point
+        archived_time, archived_value = self._last_emitted
+        dt = (timestamp - archived_time).total_seconds()
+        if dt <= 0:
+            return timestamp, archived_value
+        slope = min(max((value - archived_value) / dt, self._lower_slope), self._upper_slope)
+        return timestamp, archived_value + slope * dt
+
+    def _archive(self, point: Point) -> Point:
+        self._reset_doors()
+        return super()._archive(point)
+
+    def _final_point(self) -> Point:
+        return self._fit(self._pending)
+
+    def _process(self, timestamp: datetime, value: float) -> List[Point]:
+        point = (timestamp, value)
+        if self._last_emitted is None:
+            return [self._archive(point)]
+
+        doors = (self._lower_slope, self._upper_slope)
+        if self._update_doors(timestamp, value):
+            if self._silence_exceeded(timestamp):
+                return [self._archive(self._fit(point))]
+            self._pending = point
+            return []
+
+        # Drzwi się rozeszły - archiwizujemy poprzedni odczyt i liczymy korytarz od niego
+        self._lower_slope, self._upper_slope = doors
+        emitted = [self._archive(self._fit(self._pending))] if self._pending else []
+        if not self._update_doors(timestamp, value) or self._silence_exceeded(timestamp):
+            emitted.append(self._archive(point))
+        else:
+            self._pending = point
+        return emitted
+
+
+COMPRESSORS = {
+    "deadband": DeadbandCompressor,
+    "swinging_door": SwingingDoorCompressor
+}
+
+
+def create_compressor(config: Optional[dict], span: Optional[float] = None) -> Optional[Compressor]:
+    """
+    Tworzy kompresor na podstawie konfiguracji czujnika.
+    :param config: Słownik z kluczami method, deviation lub deviation_percent, max_silence_s
+    :param span: Zakres czujnika (max - min), względem którego liczony jest deviation_percent
+    :return: Kompresor lub None, gdy kompresja jest wyłączona
+    """
+    if not config or config.get("method", "none") == "none":
+        return None
+
+    method = config["method"]
+    if method not in COMPRESSORS:
+        raise ValueError(f"Nieznana metoda kompresji: {method}")
+
+    if "deviation_percent" in config:
+        if span is None:
+            raise ValueError("deviation_percent wymaga podania zakresu czujnika.")
+        deviation = abs(span) * config["deviation_percent"] / 100
+    else:
+        deviation = config.get("deviation", 0.0)
+
+    return COMPRESSORS[method](deviation, config.get("max_silence_s", 60.0))
+
+
+def reconstruct(points: List[Point], timestamp: datetime, interpolation: str = "linear") -> Optional[float]:
+    """
+    Odtwarza wartość w chwili timestamp z punktów wyemitowanych przez kompresor.
+    :param points: Punkty (timestamp, value) posortowane po czasie
+    :param interpolation: "step" dla deadband, "linear" dla swinging door
+    :return: Wartość z dokładnością do deviation lub None przed pierwszym punktem
+    """
+    times = [t for t, _ in points]
+    index = bisect_right(times, timestamp)
+    if index == 0:
+        return None
+    left_time, left_value = points[index - 1]
+    if interpolation == "step" or index == len(points) or left_time == timestamp:
+        return left_value
+    right_time, right_value = points[index]
+    fraction = (timestamp - left_time).total_seconds() / (right_time - left_time).total_seconds()
+    return left_value + fraction * (right_value - left_value)
+
+
+def time_weighted_average(points: List[Point], start: datetime, end: datetime,
+                          interpolation: str = "linear") -> Optional[float]:
+    """
+    Liczy średnią ważoną czasem szeregu odtworzonego z punktów w przedziale [start, end].
+    Po ostatnim punkcie wartość jest utrzymywana do końca przedziału.
+    :param points: Punkty (timestamp, value) posortowane po czasie
+    :param interpolation: "step" dla deadband, "linear" dla swinging door
+    :return: Średnia lub None, gdy w przedziale nie ma danych
+    """
+    first_value = reconstruct(points, start, interpolation)
+    knots = [(start, first_value)] if first_value is not None else []
+    knots += [point for point in points if start < point[0] < end]
+    if not knots:
+        return None
+    knots.append((end, reconstruct(points, end, interpolation)))
+
+    area = 0.0
+    duration = 0.0
+    for (left_time, left_value), (right_time, right_value) in zip(knots, knots[1:]):
+        dt = (right_time - left_time).total_seconds()
+        height = left_value if interpolation == "step" else (left_value + right_value) / 2
+        area += height * dt
+        duration += dt
+    return area / duration if duration > 0 else knots[-1][1]
@@ -5,6 +5,7 @@ import queue
 from datetime import datetime, timedelta
 import json
 from server.server import NetworkServer
+from Sensory import time_weighted_average
 
 
 class ServerGUI:
@@ -19,6 +20,7 @@ class ServerGUI:
         self.message_queue = queue.Queue()
         self.sensors = {}
         self.history = []  # Przechowuje historię odczytów dla średnich
+        self.interpolation = {}  # Sposób odtwarzania szeregu dla czujników z kompresją
 
         # Setup GUI
         self.setup_gui()
@@ -101,7 +103,8 @@ class ServerGUI:
 
             self.start_button.config(state=tk.DISABLED)
             self.stop_button.config(state=tk.NORMAL)
-            self.status_var.set(f"Server listening on port {port}")
+            # Port is used only by the tcp transport, unix/shm come from config.yaml
+            self.status_var.set(f"Server listening on {self.server.describe()}")
 
         except Exception as e:
             self.status_var.set(f"Error: {str(e)}")
@@ -110,8 +113,10 @@ class ServerGUI:
         """Stop the server"""
         self.running = False
         if self.server:
-            # Proper server shutdown would need to be implemented
-            pass
+            # Wait for the server thread so a restart can bind the same address again
+            self.server.stop()
+            self.server_thread.join(timeout=1)
+            self.server = None
 
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
@@ -123,6 +128,8 @@ class ServerGUI:
             while True:
                 msg_type, msg = self.message_queue.get_nowait()
                 if msg_type == "sensor_data":
+                    if 'interpolation' in msg:
+                        self.interpolation[msg['sensor_id']] = msg['interpolation']
                     self.history.append({
                         'sensor_id': msg['sensor_id'],
                         'value': float(msg['value']),
@@ -142,6 +149,18 @@ class ServerGUI:
         one_hour_ago = now - timedelta(hours=1)
         twelve_hours_ago = now - timedelta(hours=12)
 
+        # Compressed sensors send points only when the value changes, so a plain
+        # mean would be weighted by change rate - rebuild the series and weight by time
+        interpolation = self.interpolation.get(sensor_id)
+        if interpolation:
+            points = sorted(
+                (entry['timestamp'], entry['value'])
+                for entry in self.history if entry['sensor_id'] == sensor_id
+            )
+            avg_1h = time_weighted_average(points, one_hour_ago, now, interpolation) or 0
+            avg_12h = time_weighted_average(points, twelve_hours_ago, now, interpolation) or 0
+            return round(avg_1h, 2), round(avg_12h, 2)
+
         values_1h = []
         values_12h = []
 
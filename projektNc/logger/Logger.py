@@ -23,6 +23,8 @@ class Logger:
         self.max_size_mb = config["max_size_mb"]
         self.rotate_after_lines = config["rotate_after_lines"]
         self.retention_days = config["retention_days"]
+        # Ustawienia kompresji czujników (opcjonalne), wczytywane razem z resztą konfiguracji
+        self.compression = config.get("compression", {})
 
         # Inicjalizacja katalogów
         os.makedirs(self.log_dir, exist_ok=True)
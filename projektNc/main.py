@@ -1,10 +1,27 @@
 from logger import Logger
-from Sensory import TemperatureSensor, HumiditySensor, PressureSensor, LightSensor
+from Sensory import TemperatureSensor, HumiditySensor, PressureSensor, LightSensor, create_compressor
 from network.client import NetworkClient
 from datetime import datetime, timedelta
 import time
 
 
+def publish(logger, client, sensor, timestamp, value, compressor=None):
+    # Log locally
+    logger.log_reading(sensor.sensor_id, timestamp, value, sensor.unit)
+
+    # Send to server
+    data = {
+        "sensor_id": sensor.sensor_id,
+        "value": value,
+        "unit": sensor.unit,
+        "timestamp": timestamp.isoformat()
+    }
+    if compressor:
+        # Server needs to know how to fill the gaps between compressed points
+        data["interpolation"] = compressor.interpolation
+    client.send(data)
+
+
 def main():
     # Initialize logger
     logger = Logger("config.json")
@@ -21,6 +38,15 @@ def main():
         LightSensor("Ilość światła", "Light Sensor", "lux", 0, 10000)
     ]
 
+    # Optional per-sensor compression (deadband / swinging door), loaded by Logger from config.json
+    compressors = {
+        sensor.sensor_id: create_compressor(
+            logger.compression.get(sensor.sensor_id),
+            sensor.max_value - sensor.min_value
+        )
+        for sensor in sensors
+    }
+
     try:
         # Run for 5 minutes
         end_time = datetime.now() + timedelta(minutes=5)
@@ -30,23 +56,22 @@ def main():
                 value = sensor.read_value()
                 timestamp = datetime.now()
 
-                # Log locally
-                logger.log_reading(sensor.sensor_id, timestamp, value, sensor.unit)
-
-                # Send to server
-                data = {
-                    "sensor_id": sensor.sensor_id,
-                    "value": value,
-                    "unit": sensor.unit,
-                    "timestamp": timestamp.isoformat()
-                }
-                client.send(data)
+                compressor = compressors[sensor.sensor_id]
+                points = compressor.process(timestamp, value) if compressor else [(timestamp, value)]
+                for point_time, point_value in points:
+                    publish(logger, client, sensor, point_time, point_value, compressor)
 
             time.sleep(1)
 
     except KeyboardInterrupt:
         print("\nStopping sensor simulation...")
     finally:
+        for sensor in sensors:
+            compressor = compressors[sensor.sensor_id]
+            if compressor:
+                for point_time, point_value in compressor.flush():
+                    publish(logger, client, sensor, point_time, point_value, compressor)
+                print(f"{sensor.sensor_id} compression: {compressor.stats()}")
         logger.stop()
 
 
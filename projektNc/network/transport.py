@@ -0,0 +1,381 @@
+import errno
+import itertools
+import os
+import socket
+import stat
+import struct
+import time
+from multiprocessing import shared_memory
+
+
+TRANSPORTS = ("tcp", "unix", "shm")
+
+DEFAULT_SOCKET_PATH = "/tmp/projektnc.sock"
+DEFAULT_SHM_NAME = "projektnc_ring"
+DEFAULT_SHM_SIZE = 1024 * 1024
+
+
+class TcpTransport:
+    """Transport TCP: osobne połączenie dla każdej wiadomości (zachowanie domyślne)."""
+
+    def __init__(self, host: str, port: int, timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.socket = None
+
+    def connect(self) -> None:
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.settimeout(self.timeout)
+        self.socket.connect((self.host, self.port))
+
+    def send(self, message: bytes) -> bool:
+        try:
+            self.connect()
+            self.socket.sendall(message)
+            return self._recv_ack()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+
+    def _recv_ack(self) -> bool:
+        response = self.socket.recv(1024).decode("utf-8").strip()
+        return response == "ACK"
+
+
+class UnixTransport(TcpTransport):
+    """Transport AF_UNIX: jedno trwałe połączenie, wiadomości rozdzielone znakiem nowej linii."""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 5.0):
+        super().__init__(host=None, port=None, timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(self.timeout)
+        self.socket.connect(self.socket_path)
+
+    def send(self, message: bytes) -> bool:
+        try:
+            if self.socket is None:
+                self.connect()
+            self.socket.sendall(message)
+            if self._recv_ack():
+                return True
+        except Exception:
+            # Zerwane połączenie - kolejna próba nawiąże je od nowa
+            self.close()
+            raise
+        # Brak ACK (np. serwer zamknął połączenie) - nie używamy dalej tego gniazda
+        self.close()
+        return False
+
+
+class ShmRingBuffer:
+    """
+    Bufor cykliczny w pamięci współdzielonej dla jednego producenta i jednego konsumenta.
+
+    Nagłówek zawiera dwa liczniki bajtów: head (zapisywany tylko przez producenta)
+    i tail (zapisywany tylko przez konsumenta), więc żadna blokada nie jest potrzebna.
+    Konsument zapisuje też znacznik otwarcia i czas ostatniej aktywności, po których
+    producent rozpoznaje, że serwer zamknął lub porzucił bufor. Pole producer wskazuje
+    jedynego dopuszczonego producenta (pid procesu i numer transportu).
+    Rekord to 4-bajtowa długość i treść wiadomości.
+
+    Pola nagłówka są czytane i zapisywane przez memoryview w formacie 'Q', czyli jedną
+    8-bajtową operacją. struct.pack_into najpierw zeruje pole, więc drugi proces mógłby
+    odczytać chwilowe 0 zamiast licznika.
+    """
+
+    HEADER = struct.Struct("=QQQQQ")
+    LENGTH = struct.Struct("<I")
+    # Indeksy 8-bajtowych słów nagłówka
+    HEAD, TAIL, STATE, HEARTBEAT, PRODUCER = range(5)
+    # Serwer odświeża heartbeat co najwyżej kilka milisekund, dłuższa cisza oznacza porzucony bufor
+    CONSUMER_TIMEOUT_S = 2.0
+
+    def __init__(self, name: str = DEFAULT_SHM_NAME, size: int = DEFAULT_SHM_SIZE, create: bool = False):
+        self.name = name
+        self.owner = create
+        if create:
+            self._remove_stale_segment(name)
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self.HEADER.pack_into(self._shm.buf, 0, 0, 0, 1, time.time_ns(), 0)
+        else:
+            self._shm = _attach_shared_memory(name)
+        self._buf = self._shm.buf
+        self._words = self._buf[:self.HEADER.size].cast("Q")
+        self.capacity = self._shm.size - self.HEADER.size
+
+    @classmethod
+    def _remove_stale_segment(cls, name: str) -> None:
+        """
+        Usuwa segment po poprzednim serwerze. Segmentu, który wciąż ma aktywnego
+        konsumenta, nie przejmuje - tak jak bind() na zajętym porcie TCP.
+        """
+        try:
+            stale = cls(name)
+        except FileNotFoundError:
+            return
+        try:
+            if stale.consumer_alive(cls.CONSUMER_TIMEOUT_S):
+                raise FileExistsError(f"Bufor {name} jest używany przez działający serwer")
+            # Klienci podłączeni do starego segmentu muszą podłączyć się do nowego
+            stale._set(cls.STATE, 0)
+            _unlink_untracked(stale._shm)
+        finally:
+            stale.close()
+
+    def _field(self, index: int) -> int:
+        return self._words[index]
+
+    def _set(self, index: int, value: int) -> None:
+        self._words[index] = value
+
+    def _head(self) -> int:
+        return self._field(self.HEAD)
+
+    def _tail(self) -> int:
+        return self._field(self.TAIL)
+
+    def touch(self) -> None:
+        """
+        Odświeża czas aktywności konsumenta (wywoływane przez serwer w pętli odczytu).
+        """
+        self._set(self.HEARTBEAT, time.time_ns())
+
+    def is_open(self) -> bool:
+        return self._field(self.STATE) == 1
+
+    def consumer_alive(self, max_idle_s: float) -> bool:
+        """
+        Sprawdza, czy serwer nie zamknął bufora i był aktywny w ciągu max_idle_s sekund.
+        """
+        if not self.is_open():
+            return False
+        return (time.time_ns() - self._field(self.HEARTBEAT)) / 1e9 <= max_idle_s
+
+    def claim_producer(self, producer: int) -> None:
+        """
+        Rejestruje producenta. Drugi producent zepsułby licznik head, więc bufor
+        zajęty przez żyjący proces nie zostaje przejęty.
+        """
+        current = self._field(self.PRODUCER)
+        if current not in (0, producer) and _process_alive(current >> 32):
+            raise ConnectionError(f"Bufor {self.name} ma już producenta (pid {current >> 32})")
+        self._set(self.PRODUCER, producer)
+
+    def release_producer(self, producer: int) -> None:
+        if self._field(self.PRODUCER) == producer:
+            self._set(self.PRODUCER, 0)
+
+    def put(self, message: bytes) -> bool:
+        """
+        Zapisuje wiadomość do bufora. Zwraca False, gdy brakuje miejsca.
+        """
+        record = self.LENGTH.pack(len(message)) + message
+        head = self._head()
+        if len(record) > self.capacity - (head - self._tail()):
+            return False
+        self._write(head, record)
+        self._set(self.HEAD, head + len(record))
+        return True
+
+    def get(self):
+        """
+        Zwraca kolejną wiadomość albo None, gdy bufor jest pusty.
+        """
+        tail = self._tail()
+        if tail == self._head():
+            return None
+        length = self.LENGTH.unpack(self._read(tail, self.LENGTH.size))[0]
+        message = self._read(tail + self.LENGTH.size, length)
+        self._set(self.TAIL, tail + self.LENGTH.size + length)
+        return message
+
+    def _write(self, position: int, data: bytes) -> None:
+        start = position % self.capacity
+        first = min(len(data), self.capacity - start)
+        offset = self.HEADER.size + start
+        self._buf[offset:offset + first] = data[:first]
+        if first < len(data):
+            self._buf[self.HEADER.size:self.HEADER.size + len(data) - first] = data[first:]
+
+    def _read(self, position: int, length: int) -> bytes:
+        start = position % self.capacity
+        first = min(length, self.capacity - start)
+        offset = self.HEADER.size + start
+        data = bytes(self._buf[offset:offset + first])
+        if first < length:
+            data += bytes(self._buf[self.HEADER.size:self.HEADER.size + length - first])
+        return data
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        # Segment przejęty przez inny serwer ma już STATE=0, a nazwa wskazuje nowy segment
+        unlink = self.owner and self.is_open()
+        if unlink:
+            # Klienci podłączeni do tego segmentu muszą podłączyć się do nowego
+            self._set(self.STATE, 0)
+        self._words.release()
+        self._buf = None
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+        elif self.owner:
+            _forget_segment(self._shm)
+        self._shm = None
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Podłącza się do istniejącego segmentu bez rejestrowania go w resource_trackerze,
+    który przed Pythonem 3.13 usuwałby segment serwera przy wyjściu klienta.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _unlink_untracked(shm: shared_memory.SharedMemory) -> None:
+    """
+    Usuwa segment podłączony przez _attach_shared_memory() bez wyrejestrowywania go
+    z resource_trackera, w którym nigdy nie był zarejestrowany.
+    """
+    if getattr(shm, "_track", True) is False:
+        shm.unlink()
+        return
+    try:
+        import _posixshmem
+    except ImportError:
+        # Windows: segment znika razem z ostatnim uchwytem
+        return
+    _posixshmem.shm_unlink(shm._name)
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill(pid, 0) zakończyłby proces na Windows - zakładamy, że producent żyje,
+        # a blokadę zwalnia close() lub restart serwera (nowy segment)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _forget_segment(shm: shared_memory.SharedMemory) -> None:
+    """
+    Wyrejestrowuje utworzony segment z resource_trackera, aby przy wyjściu procesu
+    nie usunął on segmentu nowego serwera o tej samej nazwie.
+    """
+    try:
+        import _posixshmem  # noqa: F401
+    except ImportError:
+        return
+    from multiprocessing import resource_tracker
+    resource_tracker.unregister(shm._name, "shared_memory")
+
+
+class ShmTransport:
+    """
+    Transport przez bufor cykliczny w pamięci współdzielonej (bez potwierdzeń ACK).
+    Sukces oznacza zapis do bufora, który odczytuje działający serwer.
+    """
+
+    def __init__(self, shm_name: str = DEFAULT_SHM_NAME, timeout: float = 5.0):
+        self.shm_name = shm_name
+        self.timeout = timeout
+        self.ring = None
+        self._producer_id = next(_producer_ids)
+
+    @property
+    def producer(self) -> int:
+        return (os.getpid() << 32) | self._producer_id
+
+    def connect(self) -> None:
+        ring = ShmRingBuffer(self.shm_name)
+        try:
+            ring.claim_producer(self.producer)
+        except ConnectionError:
+            ring.close()
+            raise
+        self.ring = ring
+
+    def send(self, message: bytes) -> bool:
+        if self.ring is None or not self.ring.consumer_alive(self.timeout):
+            # Serwer zrestartowany lub zamknięty - podłączamy się do aktualnego segmentu
+            self.close()
+            self.connect()
+            if not self.ring.consumer_alive(self.timeout):
+                self.close()
+                raise ConnectionError(f"Serwer nie odczytuje bufora {self.shm_name}")
+        # Pełny bufor oznacza, że serwer nie nadąża - czekamy najwyżej timeout
+        deadline = time.monotonic() + self.timeout
+        while not self.ring.put(message):
+            if time.monotonic() >= deadline or not self.ring.consumer_alive(self.timeout):
+                # Kolejna próba podłączy się od nowa zamiast czekać na ten sam bufor
+                self.close()
+                return False
+            time.sleep(0.0001)
+        return True
+
+    def close(self) -> None:
+        if self.ring:
+            self.ring.release_producer(self.producer)
+            self.ring.close()
+            self.ring = None
+
+
+_producer_ids = itertools.count(1)
+
+
+def create_transport(config: dict, host: str = None, port: int = None, timeout: float = 5.0):
+    """
+    Tworzy transport klienta na podstawie sekcji 'client' konfiguracji.
+    """
+    kind = config.get("transport", "tcp")
+    if kind == "tcp":
+        return TcpTransport(host, port, timeout)
+    if kind == "unix":
+        return UnixTransport(config.get("socket_path", DEFAULT_SOCKET_PATH), timeout)
+    if kind == "shm":
+        return ShmTransport(config.get("shm_name", DEFAULT_SHM_NAME), timeout)
+    raise ValueError(f"Nieznany transport: {kind} (dostępne: {', '.join(TRANSPORTS)})")
+
+
+def remove_stale_socket(path: str) -> None:
+    """
+    Usuwa gniazdo pozostałe po poprzednim uruchomieniu serwera AF_UNIX.
+    Gniazda, na którym nasłuchuje działający serwer, ani zwykłego pliku nie usuwa.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} istnieje i nie jest gniazdem")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.remove(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, os.strerror(errno.EADDRINUSE), path)
@@ -1,53 +1,158 @@
+import os
 import socket
 import json
 import threading
+import time
+from network.config import load_config
+from network.transport import (
+    ShmRingBuffer,
+    remove_stale_socket,
+    TRANSPORTS,
+    DEFAULT_SOCKET_PATH,
+    DEFAULT_SHM_NAME,
+    DEFAULT_SHM_SIZE,
+)
+
+
+# time.sleep(0) na Linuksie usypia na ~50 us (timer slack), sched_yield tylko oddaje procesor
+_yield_cpu = getattr(os, "sched_yield", lambda: time.sleep(0))
+
+
+def _load_server_config():
+    # Serwer TCP działa bez config.yaml, tak jak przed dodaniem transportów
+    try:
+        return (load_config() or {}).get("server") or {}
+    except FileNotFoundError:
+        return {}
 
 
 class NetworkServer:
-    def __init__(self, port=5001, message_queue=None):
+    def __init__(self, port=5001, message_queue=None, transport=None):
+        config = {} if transport == "tcp" else _load_server_config()
         self.port = port
         self.message_queue = message_queue
+        self._stop_event = threading.Event()
+        self.transport = transport or config.get("transport", "tcp")
+        self.socket_path = config.get("socket_path", DEFAULT_SOCKET_PATH)
+        self.shm_name = config.get("shm_name", DEFAULT_SHM_NAME)
+        self.shm_size = config.get("shm_size", DEFAULT_SHM_SIZE)
+        if self.transport not in TRANSPORTS:
+            raise ValueError(f"Nieznany transport: {self.transport}")
+
+    def describe(self):
+        if self.transport == "unix":
+            return f"socket {self.socket_path}"
+        if self.transport == "shm":
+            return f"shared memory ring {self.shm_name}"
+        return f"port {self.port}"
 
     def start(self):
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-                s.bind(('0.0.0.0', self.port))
-                s.listen(5)
-                print(f"[SERVER] Listening on port {self.port}")
-
-                while True:
-                    conn, addr = s.accept()
-                    print(f"[SERVER] Connection from {addr}")
-                    threading.Thread(
-                        target=self.handle_client,
-                        args=(conn,),
-                        daemon=True
-                    ).start()
+            if self.transport == "shm":
+                self._serve_shm()
+            else:
+                self._serve_stream()
         except Exception as e:
             print(f"[SERVER ERROR] {e}")
 
+    def stop(self):
+        self._stop_event.set()
+
+    def _serve_stream(self):
+        if self.transport == "unix":
+            remove_stale_socket(self.socket_path)
+            s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address = self.socket_path
+        else:
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            address = ('0.0.0.0', self.port)
+
+        with s:
+            s.bind(address)
+            s.listen(5)
+            # Krótki timeout accept() pozwala sprawdzać, czy wywołano stop()
+            s.settimeout(0.5)
+            print(f"[SERVER] Listening on {self.describe()}")
+
+            while not self._stop_event.is_set():
+                try:
+                    conn, addr = s.accept()
+                except socket.timeout:
+                    continue
+                print(f"[SERVER] Connection from {addr or self.socket_path}")
+                threading.Thread(
+                    target=self.handle_client,
+                    args=(conn,),
+                    daemon=True
+                ).start()
+
+    def _serve_shm(self, spin_s=0.0002, yield_s=0.02, poll_interval=0.0005):
+        # Adaptacyjne czekanie na dane: najpierw aktywne sprawdzanie head != tail,
+        # potem oddawanie procesora (sched_yield), a dopiero po dłuższej ciszy zwykły sleep
+        ring = ShmRingBuffer(self.shm_name, self.shm_size, create=True)
+        print(f"[SERVER] Reading {self.describe()}")
+        idle_since = None
+        try:
+            while not self._stop_event.is_set():
+                if not ring.is_open():
+                    print(f"[SERVER] {self.describe()} was taken over, stopping")
+                    break
+                ring.touch()
+                raw = ring.get()
+                if raw is None:
+                    now = time.perf_counter()
+                    if idle_since is None:
+                        idle_since = now
+                    idle = now - idle_since
+                    if idle >= yield_s:
+                        time.sleep(poll_interval)
+                    elif idle >= spin_s:
+                        _yield_cpu()
+                    continue
+                idle_since = None
+                try:
+                    self._dispatch(raw)
+                except Exception as e:
+                    print(f"[SERVER] Client error: {e}")
+                    if self.message_queue:
+                        self.message_queue.put(("error", str(e)))
+        finally:
+            ring.close()
+
     def handle_client(self, conn):
+        # Klient może wysłać kilka wiadomości w jednym połączeniu (np. transport unix),
+        # każda zakończona nową linią dostaje osobne ACK
         try:
             data = b""
             while True:
-                chunk = conn.recv(1024)
+                chunk = conn.recv(4096)
                 if not chunk:
                     break
                 data += chunk
-                if b"\n" in chunk:
-                    break
+                while b"\n" in data:
+                    line, data = data.split(b"\n", 1)
+                    if line.strip():
+                        self._dispatch(line)
+                        conn.sendall(b"ACK\n")
 
-            message = json.loads(data.decode('utf-8'))
-            print(f"[SERVER] Received: {message}")
-
-            if self.message_queue:
-                self.message_queue.put(("sensor_data", message))
-
-            conn.sendall(b"ACK\n")
+            # Wiadomość bez końcowej nowej linii - klient zakończył wysyłanie (shutdown)
+            if data.strip():
+                self._dispatch(data)
+                try:
+                    conn.sendall(b"ACK\n")
+                except OSError:
+                    pass
         except Exception as e:
             print(f"[SERVER] Client error: {e}")
             if self.message_queue:
                 self.message_queue.put(("error", str(e)))
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+    def _dispatch(self, raw):
+        message = json.loads(raw.decode('utf-8'))
+        print(f"[SERVER] Received: {message}")
+
+        if self.message_queue:
+            self.message_queue.put(("sensor_data", message))
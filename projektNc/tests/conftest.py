@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Testy uruchamiane z katalogu projektu importują moduły tak jak main.py i gui.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,93 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from Sensory import (
+    DeadbandCompressor,
+    SwingingDoorCompressor,
+    create_compressor,
+    reconstruct,
+    time_weighted_average,
+)
+
+START = datetime(2025, 1, 1)
+
+
+def random_walk(seed, samples=2000, step=1.0):
+    rng = random.Random(seed)
+    value = 1013.0
+    readings = []
+    for i in range(samples):
+        value += rng.gauss(0, step)
+        if rng.random() < 0.01:
+            value += 10
+        readings.append((START + timedelta(seconds=i), value))
+    return readings
+
+
+def compress(compressor, readings):
+    points = []
+    for timestamp, value in readings:
+        points += compressor.process(timestamp, value)
+    return points + compressor.flush()
+
+
+@pytest.mark.parametrize("compressor_class", [DeadbandCompressor, SwingingDoorCompressor])
+@pytest.mark.parametrize("seed", range(10))
+def test_reconstruction_stays_within_deviation(compressor_class, seed):
+    compressor = compressor_class(deviation=1.0, max_silence_s=30)
+    readings = random_walk(seed, step=0.3 if seed % 2 else 1.5)
+    points = compress(compressor, readings)
+
+    for timestamp, value in readings:
+        rebuilt = reconstruct(points, timestamp, compressor.interpolation)
+        assert abs(rebuilt - value) <= compressor.deviation + 1e-9
+    assert compressor.emitted == len(points)
+    assert compressor.compression_ratio > 1
+
+
+@pytest.mark.parametrize("compressor_class", [DeadbandCompressor, SwingingDoorCompressor])
+def test_heartbeat_limits_silence(compressor_class):
+    compressor = compressor_class(deviation=5.0, max_silence_s=10)
+    readings = [(START + timedelta(seconds=i), 20.0) for i in range(100)]
+    points = compress(compressor, readings)
+
+    gaps = [(b[0] - a[0]).total_seconds() for a, b in zip(points, points[1:])]
+    assert max(gaps) <= 10
+    assert all(value == 20.0 for _, value in points)
+
+
+@pytest.mark.parametrize("compressor_class", [DeadbandCompressor, SwingingDoorCompressor])
+def test_flush_emits_last_reading_once(compressor_class):
+    compressor = compressor_class(deviation=5.0, max_silence_s=60)
+    readings = [(START + timedelta(seconds=i), 20.0 + i * 0.01) for i in range(10)]
+    points = compress(compressor, readings)
+
+    assert points[-1][0] == readings[-1][0]
+    assert abs(points[-1][1] - readings[-1][1]) <= compressor.deviation
+    assert compressor.flush() == []
+
+
+def test_create_compressor_from_config():
+    assert create_compressor(None) is None
+    assert create_compressor({"method": "none"}) is None
+
+    compressor = create_compressor({"method": "swinging_door", "deviation_percent": 1, "max_silence_s": 5}, span=200)
+    assert isinstance(compressor, SwingingDoorCompressor)
+    assert compressor.deviation == 2.0
+    assert compressor.max_silence_s == 5
+
+    with pytest.raises(ValueError):
+        create_compressor({"method": "unknown"})
+    with pytest.raises(ValueError):
+        create_compressor({"method": "deadband", "deviation_percent": 1})
+
+
+def test_time_weighted_average():
+    points = [(START, 0.0), (START + timedelta(seconds=10), 10.0)]
+    end = START + timedelta(seconds=20)
+
+    assert time_weighted_average(points, START, end, "linear") == 7.5
+    assert time_weighted_average(points, START, end, "step") == 5.0
+    assert time_weighted_average(points, START - timedelta(seconds=10), START - timedelta(seconds=5)) is None
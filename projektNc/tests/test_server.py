@@ -0,0 +1,57 @@
+import json
+import queue
+import socket
+import threading
+
+from server.server import NetworkServer
+
+
+def test_tcp_server_does_not_need_config_yaml(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    server = NetworkServer(port=5001, transport="tcp")
+    assert server.transport == "tcp"
+
+
+def test_server_defaults_to_tcp_without_config_yaml(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert NetworkServer().transport == "tcp"
+
+    (tmp_path / "config.yaml").write_text("")
+    assert NetworkServer().transport == "tcp"
+
+
+def test_handle_client_dispatches_message_without_newline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    messages = queue.Queue()
+    server = NetworkServer(message_queue=messages, transport="tcp")
+    client, conn = socket.socketpair()
+    thread = threading.Thread(target=server.handle_client, args=(conn,))
+    thread.start()
+
+    client.sendall(json.dumps({"sensor_id": "P1", "value": 1013.0}).encode("utf-8"))
+    client.shutdown(socket.SHUT_WR)
+    assert client.recv(1024) == b"ACK\n"
+    thread.join()
+    client.close()
+
+    assert messages.get_nowait() == ("sensor_data", {"sensor_id": "P1", "value": 1013.0})
+
+
+def test_handle_client_acks_each_line(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    messages = queue.Queue()
+    server = NetworkServer(message_queue=messages, transport="tcp")
+    client, conn = socket.socketpair()
+    thread = threading.Thread(target=server.handle_client, args=(conn,))
+    thread.start()
+
+    client.sendall(b'{"value": 1}\n{"value": 2}\n')
+    client.shutdown(socket.SHUT_WR)
+    acks = b""
+    while chunk := client.recv(1024):
+        acks += chunk
+    thread.join()
+    client.close()
+
+    assert acks == b"ACK\nACK\n"
+    assert [messages.get_nowait()[1]["value"] for _ in range(2)] == [1, 2]
@@ -0,0 +1,193 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+import pytest
+
+from network.transport import ShmRingBuffer, ShmTransport, UnixTransport, remove_stale_socket
+
+
+@pytest.fixture
+def shm_name():
+    return f"test_ring_{uuid.uuid4().hex[:8]}"
+
+
+def test_ring_buffer_wraps_around(shm_name):
+    server = ShmRingBuffer(shm_name, ShmRingBuffer.HEADER.size + 50, create=True)
+    client = ShmRingBuffer(shm_name)
+    try:
+        expected = [(b"x%d" % i) * (i % 7 + 1) for i in range(1000)]
+        received = []
+        for message in expected:
+            while not client.put(message):
+                received.append(server.get())
+        while (message := server.get()) is not None:
+            received.append(message)
+        assert received == expected
+    finally:
+        client.close()
+        server.close()
+
+
+def test_full_ring_times_out_and_detaches(shm_name):
+    server = ShmRingBuffer(shm_name, ShmRingBuffer.HEADER.size + 64, create=True)
+    transport = ShmTransport(shm_name, timeout=0.05)
+    try:
+        results = []
+        for _ in range(10):
+            server.touch()
+            results.append(transport.send(b"reading"))
+        assert results[0] is True
+        assert results[-1] is False
+        assert transport.ring is None
+    finally:
+        transport.close()
+        server.close()
+
+
+def test_send_reattaches_after_server_restart(shm_name):
+    transport = ShmTransport(shm_name, timeout=1.0)
+    old_server = ShmRingBuffer(shm_name, create=True)
+    assert transport.send(b"first")
+    assert old_server.get() == b"first"
+    old_server.close()
+
+    new_server = ShmRingBuffer(shm_name, create=True)
+    try:
+        assert transport.send(b"second")
+        assert new_server.get() == b"second"
+    finally:
+        transport.close()
+        new_server.close()
+
+
+def test_send_fails_when_consumer_is_gone(shm_name):
+    transport = ShmTransport(shm_name, timeout=1.0)
+    server = ShmRingBuffer(shm_name, create=True)
+    assert transport.send(b"first")
+    server.close()
+    with pytest.raises(FileNotFoundError):
+        transport.send(b"second")
+
+
+def test_send_fails_when_consumer_stops_reading(shm_name):
+    server = ShmRingBuffer(shm_name, create=True)
+    transport = ShmTransport(shm_name, timeout=0.05)
+    try:
+        time.sleep(0.1)
+        with pytest.raises(ConnectionError):
+            transport.send(b"reading")
+        server.touch()
+        assert transport.send(b"reading")
+    finally:
+        transport.close()
+        server.close()
+
+
+def test_new_server_refuses_live_segment(shm_name):
+    server = ShmRingBuffer(shm_name, create=True)
+    try:
+        with pytest.raises(FileExistsError):
+            ShmRingBuffer(shm_name, create=True)
+        transport = ShmTransport(shm_name, timeout=1.0)
+        assert transport.send(b"reading")
+        assert server.get() == b"reading"
+        transport.close()
+    finally:
+        server.close()
+
+
+def test_new_server_takes_over_abandoned_segment(shm_name, monkeypatch):
+    monkeypatch.setattr(ShmRingBuffer, "CONSUMER_TIMEOUT_S", 0.05)
+    old_server = ShmRingBuffer(shm_name, create=True)
+    time.sleep(0.1)
+    new_server = ShmRingBuffer(shm_name, create=True)
+    try:
+        assert not old_server.is_open()
+        old_server.close()
+        transport = ShmTransport(shm_name, timeout=1.0)
+        assert transport.send(b"reading")
+        assert new_server.get() == b"reading"
+        transport.close()
+    finally:
+        new_server.close()
+
+
+def test_second_producer_is_refused(shm_name):
+    server = ShmRingBuffer(shm_name, create=True)
+    first = ShmTransport(shm_name, timeout=1.0)
+    second = ShmTransport(shm_name, timeout=1.0)
+    try:
+        assert first.send(b"first")
+        with pytest.raises(ConnectionError):
+            second.send(b"second")
+        assert second.ring is None
+
+        first.close()
+        assert second.send(b"second")
+        assert [server.get(), server.get()] == [b"first", b"second"]
+    finally:
+        first.close()
+        second.close()
+        server.close()
+
+
+def test_producer_of_dead_process_is_replaced(shm_name):
+    server = ShmRingBuffer(shm_name, create=True)
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                          capture_output=True, text=True, check=True)
+    server.claim_producer(int(dead.stdout) << 32 | 1)
+    transport = ShmTransport(shm_name, timeout=1.0)
+    try:
+        assert transport.send(b"reading")
+        assert server.get() == b"reading"
+    finally:
+        transport.close()
+        server.close()
+
+
+def test_unix_transport_closes_socket_without_ack(tmp_path):
+    path = str(tmp_path / "server.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+
+    def close_without_ack():
+        conn, _ = listener.accept()
+        conn.recv(1024)
+        conn.close()
+
+    thread = threading.Thread(target=close_without_ack, daemon=True)
+    thread.start()
+    transport = UnixTransport(path, timeout=1.0)
+    try:
+        assert transport.send(b"reading\n") is False
+        assert transport.socket is None
+    finally:
+        thread.join()
+        listener.close()
+        os.remove(path)
+
+
+def test_remove_stale_socket_keeps_live_socket_and_files(tmp_path):
+    path = str(tmp_path / "server.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+    with pytest.raises(OSError, match="in use"):
+        remove_stale_socket(path)
+    assert os.path.exists(path)
+
+    listener.close()
+    remove_stale_socket(path)
+    assert not os.path.exists(path)
+
+    regular_file = tmp_path / "notes.txt"
+    regular_file.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        remove_stale_socket(str(regular_file))
+    assert regular_file.exists()